@@ -1,7 +1,8 @@
 import requests
 import pandas as pd
 from typing import List, Tuple
-import os
+
+from utils.DataExporter import export_catalog
 
 """
 CelesTrak client for pulling debris-group TLEs.
@@ -55,12 +56,5 @@ def fetch_debris_groups(groups: List[str] = None) -> pd.DataFrame:
 
 
 def save_tles(df: pd.DataFrame, out_dir: str = "extracted_tles", basename: str = "celestrak_debris") -> None:
-    os.makedirs(out_dir, exist_ok=True)
-    # Save combined CSV
-    csv_path = os.path.join(out_dir, f"{basename}.csv")
-    df.to_csv(csv_path, index=False)
-    for group, gdf in df.groupby("group"):
-        txt_path = os.path.join(out_dir, f"{basename}_{group}.tle")
-        with open(txt_path, "w") as f:
-            for _, row in gdf.iterrows():
-                f.write(f"{row['name']}\n{row['line1']}\n{row['line2']}\n")
+    # Combined CSV plus one .tle file per group, streamed and written in parallel
+    export_catalog(df, out_dir, basename, combined_formats=("csv",), group_formats=("tle",))
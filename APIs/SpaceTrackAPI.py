@@ -3,6 +3,8 @@ import requests
 import pandas as pd
 from typing import Optional, Dict, Any, List
 
+from utils.DataExporter import export_frame
+
 """
 Reusable Space-Track API client.
 - Reads SPACE_TRACK_USER and SPACE_TRACK_PASS from environment variables.
@@ -113,7 +115,7 @@ class SpaceTrackClient:
         path = "/".join(parts)
         data = self._query(path).json()
         df = pd.DataFrame(data)
-        df.to_csv(f"..\\DATA\\tles_{norad_cat_id}.csv", index=False)
+        export_frame(df, f"..\\DATA\\tles_{norad_cat_id}.csv", "csv")
         return df
 
     def fetch_tle_by_id_and_epoch(self, norad_cat_id: int, epoch_start: Optional[str] = None, epoch_end: Optional[str] = None, orderby: str = "EPOCH desc", limit: Optional[int] = None) -> pd.DataFrame:
@@ -139,7 +141,7 @@ class SpaceTrackClient:
         path = "/".join(parts)
         data = self._query(path).json()
         df = pd.DataFrame(data)
-        df.to_csv(f"tles_{norad_cat_id}_epoch_{epoch_start}.csv", index=False)
+        export_frame(df, f"tles_{norad_cat_id}_epoch_{epoch_start}.csv", "csv")
         return df
 
 class space_track_client:
@@ -0,0 +1,510 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from sgp4.api import Satrec, SatrecArray, WGS72
+
+from utils.Moid import moid_pairs, orbit_geometry, short_period_pad_km
+from utils.TleUtils import parse_norad_from_tle1, tle_columns
+
+"""
+Incremental conjunction screening over a refreshed TLE catalog.
+- Keeps a fingerprint of every object's TLE plus its propagated states on a shared time grid.
+- On refresh, only objects whose elements changed are re-propagated, and only pairs
+  involving them are re-screened; every other pair keeps its previous result.
+- Alerts are emitted only for conjunctions that are new or whose TCA / miss distance moved.
+- Optionally, candidate pairs whose MOID exceeds `moid_threshold_km` are dropped before distance screening.
+  The MOID uses SGP4 mean elements at mid-window and is padded by how far each orbit can drift
+  over the window; deep-space objects, whose lunar-solar terms are not bounded this way, always pass.
+State storage is one float32 position and velocity per object and step, i.e. 24 bytes x objects x steps
+(about 3.5 GB for 100k objects on the default one-day, 60 s grid); shorten span_s or coarsen step_s to cut it.
+Storage grows in blocks of ROW_BLOCK rows, copying one array at a time; preallocate with `capacity`
+to avoid the copies.
+Sliding the screening window forward by whole steps (set_window) keeps every cached state
+and result, propagating and screening only the newly exposed steps.
+"""
+
+DEFAULT_THRESHOLD_KM = 5.0
+DEFAULT_STEP_S = 60.0
+DEFAULT_SPAN_S = 86400.0
+FINE_STEP_S = 1.0
+# Extra distance allowed at the coarse stage to absorb linear-motion interpolation error
+COARSE_MARGIN_KM = 10.0
+# Upper bound on pair x time-step elements evaluated in one distance chunk
+PAIR_CHUNK_ELEMENTS = 4_000_000
+# Rows added each time the state storage has to grow
+ROW_BLOCK = 1024
+
+
+class Conjunction(NamedTuple):
+    id_a: int
+    id_b: int
+    tca: np.datetime64
+    miss_km: float
+
+
+class Alert(NamedTuple):
+    kind: str  # "new" or "changed"
+    conjunction: Conjunction
+    previous: Optional[Conjunction]
+
+
+def tle_fingerprint(line1: str, line2: str) -> bytes:
+    return hashlib.blake2b(f"{line1.strip()}\n{line2.strip()}".encode(), digest_size=16).digest()
+
+
+def _jd_fr(time_arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Split into whole/fractional Julian dates without losing microsecond precision
+    us = np.asarray(time_arr).astype("datetime64[us]").astype(np.int64)
+    day_us = 86400 * 10 ** 6
+    return 2440587.5 + (us // day_us).astype(float), (us % day_us).astype(float) / day_us
+
+
+def _closest_approach(dr: np.ndarray, dv: np.ndarray, half_step_s: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Linear-motion closest approach around each sample, limited to +/- half a step.
+    dr, dv: relative position/velocity shaped (..., 3). Returns (distance_km, time_offset_s).
+    """
+    dv2 = np.einsum("...k,...k->...", dv, dv)
+    tau = -np.einsum("...k,...k->...", dr, dv) / np.maximum(dv2, 1e-12)
+    tau = np.clip(tau, -half_step_s, half_step_s)
+    d = np.linalg.norm(dr + dv * tau[..., np.newaxis], axis=-1)
+    return np.where(np.isnan(d), np.inf, d), tau
+
+
+class ConjunctionMonitor:
+    def __init__(self, threshold_km: float = DEFAULT_THRESHOLD_KM, step_s: float = DEFAULT_STEP_S,
+                 span_s: float = DEFAULT_SPAN_S, start: Optional[np.datetime64] = None,
+                 change_tol_km: float = 0.5, change_tol_s: float = 10.0,
+                 moid_threshold_km: Optional[float] = None, capacity: int = 0):
+        self.threshold_km = threshold_km
+        self.change_tol_km = change_tol_km
+        self.change_tol_s = change_tol_s
+        if moid_threshold_km is not None and moid_threshold_km < threshold_km + COARSE_MARGIN_KM:
+            raise ValueError(f"moid_threshold_km must be at least threshold_km + COARSE_MARGIN_KM "
+                             f"({threshold_km + COARSE_MARGIN_KM} km), got {moid_threshold_km}")
+        self.moid_threshold_km = moid_threshold_km
+        self.capacity = capacity
+        self.fingerprints: Dict[int, bytes] = {}
+        self.satrecs: Dict[int, Satrec] = {}
+        self.conjunctions: Dict[Tuple[int, int], Conjunction] = {}
+        self._pairs_by_id: Dict[int, Set[Tuple[int, int]]] = {}
+        self.set_window(start, span_s, step_s)
+
+    # ---- time grid and state storage ----
+
+    def set_window(self, start: Optional[np.datetime64] = None, span_s: Optional[float] = None,
+                   step_s: Optional[float] = None) -> List[Alert]:
+        """
+        (Re)define the screening time grid. Loaded objects and their conjunctions are kept.
+        When the start moves forward by whole steps (same span and step), cached states are
+        shifted and only the newly exposed steps are propagated and screened; any other change
+        re-propagates every loaded object. Conjunctions whose TCA falls before the new start
+        are dropped without an alert.
+        Returns alerts for conjunctions that are new or changed on the new grid.
+        """
+        if start is None:
+            start = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), "s")
+        start = np.datetime64(start, "us")
+        span_s = span_s if span_s is not None else getattr(self, "span_s", DEFAULT_SPAN_S)
+        step_s = step_s if step_s is not None else getattr(self, "step_s", DEFAULT_STEP_S)
+
+        first = not hasattr(self, "time_arr")
+        shift = None
+        if not first and span_s == self.span_s and step_s == self.step_s:
+            steps = (start - self.start) / np.timedelta64(int(round(step_s * 1e6)), "us")
+            if steps == int(steps) and 0 <= steps < len(self.time_arr):
+                shift = int(steps)
+
+        self.span_s = span_s
+        self.step_s = step_s
+        self.start = start
+        offsets_us = (np.arange(0.0, self.span_s, self.step_s) * 1e6).astype("timedelta64[us]")
+        self.time_arr = self.start + offsets_us
+        self._jd, self._fr = _jd_fr(self.time_arr)
+
+        if first:
+            self._reset_storage()
+            return []
+        if shift == 0:
+            return []
+
+        previous = {k: c for k, c in self.conjunctions.items() if c.tca >= self.start}
+        expired = [k for k in self.conjunctions if k not in previous]
+        self.conjunctions.clear()
+        self._pairs_by_id.clear()
+
+        if shift is None:
+            self._reset_storage()
+            ids = list(self.satrecs)
+            if not ids:
+                return []
+            return self._record(self._screen(self._propagate(ids)), previous)
+
+        n_t = len(self.time_arr)
+        active = np.flatnonzero(self._row_ids >= 0)
+        self._shift_states(active, shift)
+        self._elements[active] = self._mean_elements([self.satrecs[int(i)] for i in self._row_ids[active]])
+        # Screen the new tail from one step early so approaches straddling the old end are caught
+        found = self._screen(active, t0=max(n_t - shift - 1, 0))
+        # Pairs whose conjunction expired may still have a secondary approach inside the window
+        pi = np.array([self._row_of.get(a, -1) for a, _ in expired], dtype=np.int64)
+        pj = np.array([self._row_of.get(b, -1) for _, b in expired], dtype=np.int64)
+        live = (pi >= 0) & (pj >= 0)
+        for key, conj in self._screen_pairs(pi[live], pj[live]).items():
+            if key not in found or conj.miss_km < found[key].miss_km:
+                found[key] = conj
+        # A conjunction still inside the window is the closest approach over the retained steps
+        for key, conj in previous.items():
+            if key not in found or conj.miss_km <= found[key].miss_km:
+                found[key] = conj
+        return self._record(found, previous)
+
+    def _reset_storage(self) -> None:
+        n_t = len(self.time_arr)
+        self._row_of: Dict[int, int] = {}
+        self._row_ids = np.full(0, -1, dtype=np.int64)
+        self._pos = np.empty((0, n_t, 3), dtype=np.float32)
+        self._vel = np.empty((0, n_t, 3), dtype=np.float32)
+        self._rmin = np.empty(0)
+        self._rmax = np.empty(0)
+        # Mean elements at mid-window for the MOID prefilter, see _mean_elements
+        self._elements = np.empty((0, 7))
+        self._free: List[int] = []
+        self._grow(self.capacity)
+
+    def _grow(self, count: int) -> None:
+        """
+        Add `count` free rows. Each array is copied into a new buffer and rebound, so views
+        taken before the call keep pointing at the old data. While one array is copied, both its
+        old and new buffers are alive.
+        """
+        if count <= 0:
+            return
+        old = len(self._row_ids)
+        new = old + count
+        for name in ("_row_ids", "_pos", "_vel", "_rmin", "_rmax", "_elements"):
+            arr = getattr(self, name)
+            grown = np.empty((new,) + arr.shape[1:], dtype=arr.dtype)
+            grown[:old] = arr
+            grown[old:] = -1 if name == "_row_ids" else np.nan
+            setattr(self, name, grown)
+        self._free.extend(range(new - 1, old - 1, -1))
+
+    def _alloc_rows(self, count: int) -> np.ndarray:
+        missing = count - len(self._free)
+        if missing > 0:
+            self._grow(missing + ROW_BLOCK)
+        return np.array([self._free.pop() for _ in range(count)], dtype=np.int64)
+
+    def _drop_objects(self, ids) -> None:
+        for sat_id in ids:
+            row = self._row_of.pop(sat_id, None)
+            if row is not None:
+                self._row_ids[row] = -1
+                self._pos[row] = np.nan
+                self._vel[row] = np.nan
+                self._rmin[row] = np.nan
+                self._rmax[row] = np.nan
+                self._elements[row] = np.nan
+                self._free.append(row)
+            self.fingerprints.pop(sat_id, None)
+            self.satrecs.pop(sat_id, None)
+            self._forget_pairs(sat_id)
+
+    def _forget_pairs(self, sat_id: int) -> Dict[Tuple[int, int], Conjunction]:
+        dropped = {}
+        for key in self._pairs_by_id.pop(sat_id, set()):
+            conj = self.conjunctions.pop(key, None)
+            if conj is not None:
+                dropped[key] = conj
+            other = key[1] if key[0] == sat_id else key[0]
+            self._pairs_by_id.get(other, set()).discard(key)
+        return dropped
+
+    def _propagate(self, ids: List[int]) -> np.ndarray:
+        rows = np.array([self._row_of.get(i, -1) for i in ids], dtype=np.int64)
+        new_mask = rows < 0
+        if new_mask.any():
+            rows[new_mask] = self._alloc_rows(int(new_mask.sum()))
+        for sat_id, row in zip(ids, rows):
+            self._row_of[sat_id] = int(row)
+            self._row_ids[row] = sat_id
+
+        sats = [self.satrecs[i] for i in ids]
+        self._elements[rows] = self._mean_elements(sats)
+        # SGP4 returns float64 states; chunk so the temporaries stay small next to the float32 store
+        chunk = max(1, PAIR_CHUNK_ELEMENTS // max(len(self.time_arr), 1))
+        for start in range(0, len(rows), chunk):
+            block = rows[start:start + chunk]
+            e, r, v = SatrecArray(sats[start:start + chunk]).sgp4(self._jd, self._fr)
+            bad = e != 0
+            r[bad] = np.nan
+            v[bad] = np.nan
+            self._pos[block] = r
+            self._vel[block] = v
+            self._update_radii(block)
+        return rows
+
+    def _mean_elements(self, sats: List[Satrec]) -> np.ndarray:
+        """
+        SGP4 mean elements at mid-window and a bound on their drift to either window edge.
+        Columns: a (km), e, inc, raan, argp (deg) at mid-window; shape_pad_km, how far the orbit's
+        own ellipse can move apart from its RAAN rotation (inf for deep-space objects); and
+        raan_turn, the RAAN change over half the window (rad), applied per pair in _moid_keep.
+        """
+        jd, fr = self._jd[0], self._fr[0]
+        half = 0.5 * self.span_s / 86400.0
+        el = np.full((len(sats), 3, 5), np.nan)
+        deep = np.zeros(len(sats), dtype=bool)
+        for k, sat in enumerate(sats):
+            deep[k] = sat.method == "d"
+            # Satrec exposes the mean elements of its last propagation; mid-window goes last
+            for m, dt in enumerate((0.0, 2.0 * half, half)):
+                if sat.sgp4(jd, fr + dt)[0] == 0:
+                    el[k, m] = sat.am * sat.radiusearthkm, sat.em, sat.im, sat.Om, sat.om
+        a, e, inc, raan, argp = el[:, 2].T
+        delta = el[:, :2] - el[:, 2:]
+        delta[..., 2:] = (delta[..., 2:] + np.pi) % (2.0 * np.pi) - np.pi
+        turn = 0.5 * (delta[:, 1, 3] - delta[:, 0, 3])
+        # Linear RAAN drift is handled per pair; only its curvature counts against the object itself
+        delta[:, 0, 3] += turn
+        delta[:, 1, 3] -= turn
+        da, de, dinc, draan, dargp = np.abs(delta).max(axis=1).T
+        apo = a * (1.0 + e)
+        # Radial gap between an ellipse and itself rotated in-plane about the focus is at most |dr/dnu| * angle
+        shape = (da * (1.0 + e) + a * de + apo * (dinc + draan) + a * e * (1.0 + e) / (1.0 - e) * dargp
+                 + short_period_pad_km(a, e))
+        shape[deep] = np.inf
+        return np.column_stack([a, e, np.degrees(inc), np.degrees(raan), np.degrees(argp), shape, turn])
+
+    def _moid_keep(self, pi: np.ndarray, pj: np.ndarray) -> np.ndarray:
+        """
+        Mask of row pairs that may come within `moid_threshold_km` during the window.
+        A RAAN rotation shared by both orbits leaves their MOID unchanged, so only the difference
+        of the two RAAN turns is charged, against the larger apogee radius.
+        """
+        el = self._elements
+        orbits = orbit_geometry(*el[:, :5].T)
+        moid = moid_pairs(orbits, orbits, pi, pj)
+        apo = orbits.a * (1.0 + orbits.e)
+        pad = (el[pi, 5] + el[pj, 5]
+               + np.maximum(apo[pi], apo[pj]) * np.abs(el[pi, 6] - el[pj, 6]))
+        # NaN (failed propagation) keeps the pair; the distance screen handles it
+        return ~(moid > self.moid_threshold_km + pad)
+
+    def _shift_states(self, rows: np.ndarray, shift: int) -> None:
+        """
+        Move cached states `shift` steps earlier and propagate the exposed tail for `rows`.
+        """
+        n_t = len(self.time_arr)
+        chunk = max(1, PAIR_CHUNK_ELEMENTS // max(n_t, 1))
+        for start in range(0, len(rows), chunk):
+            block = rows[start:start + chunk]
+            self._pos[block, :n_t - shift] = self._pos[block, shift:]
+            self._vel[block, :n_t - shift] = self._vel[block, shift:]
+            sats = [self.satrecs[int(i)] for i in self._row_ids[block]]
+            e, r, v = SatrecArray(sats).sgp4(self._jd[n_t - shift:], self._fr[n_t - shift:])
+            bad = e != 0
+            r[bad] = np.nan
+            v[bad] = np.nan
+            self._pos[block, n_t - shift:] = r
+            self._vel[block, n_t - shift:] = v
+            self._update_radii(block)
+
+    def _shell_radii(self, rows: np.ndarray, t0: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        # fmin/fmax skip failed (NaN) samples; objects that failed at every step stay NaN
+        # and never pass the shell filter
+        radius = np.linalg.norm(self._pos[rows, t0:].astype(float), axis=-1)
+        return np.fmin.reduce(radius, axis=1), np.fmax.reduce(radius, axis=1)
+
+    def _update_radii(self, rows: np.ndarray) -> None:
+        self._rmin[rows], self._rmax[rows] = self._shell_radii(rows)
+
+    # ---- screening ----
+
+    def _candidate_pairs(self, changed_rows: np.ndarray, rmin: np.ndarray,
+                         rmax: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pairs (changed row, any active row) whose radius ranges `rmin`/`rmax` (indexed by row)
+        overlap within the coarse threshold. Pairs between two changed rows are returned once.
+        """
+        active = np.flatnonzero(self._row_ids >= 0)
+        is_changed = np.zeros(len(self._row_ids), dtype=bool)
+        is_changed[changed_rows] = True
+        reach = self.threshold_km + COARSE_MARGIN_KM
+        out_i, out_j = [], []
+        chunk = max(1, PAIR_CHUNK_ELEMENTS // max(len(active), 1))
+        for start in range(0, len(changed_rows), chunk):
+            ci = changed_rows[start:start + chunk]
+            with np.errstate(invalid="ignore"):
+                overlap = ((rmin[active][np.newaxis, :] - rmax[ci][:, np.newaxis] <= reach)
+                           & (rmin[ci][:, np.newaxis] - rmax[active][np.newaxis, :] <= reach))
+            overlap &= active[np.newaxis, :] != ci[:, np.newaxis]
+            overlap &= ~(is_changed[active][np.newaxis, :] & (active[np.newaxis, :] < ci[:, np.newaxis]))
+            ii, jj = np.nonzero(overlap)
+            out_i.append(ci[ii])
+            out_j.append(active[jj])
+        if not out_i:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        pi, pj = np.concatenate(out_i), np.concatenate(out_j)
+        if self.moid_threshold_km is not None and len(pi):
+            keep = self._moid_keep(pi, pj)
+            pi, pj = pi[keep], pj[keep]
+        return pi, pj
+
+    def _coarse_screen(self, pi: np.ndarray, pj: np.ndarray,
+                       t0: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Keep pairs whose sampled closest approach from step `t0` onwards is within the coarse threshold.
+        Returns (rows_a, rows_b, time_offset_s).
+        """
+        n_t = len(self.time_arr) - t0
+        chunk = max(1, PAIR_CHUNK_ELEMENTS // max(n_t, 1))
+        keep_i, keep_j, keep_t = [], [], []
+        for start in range(0, len(pi), chunk):
+            a, b = pi[start:start + chunk], pj[start:start + chunk]
+            dr = (self._pos[b, t0:] - self._pos[a, t0:]).astype(float)
+            dv = (self._vel[b, t0:] - self._vel[a, t0:]).astype(float)
+            d, tau = _closest_approach(dr, dv, 0.5 * self.step_s)
+            k = np.argmin(d, axis=1)
+            idx = np.arange(len(a))
+            hit = d[idx, k] <= self.threshold_km + COARSE_MARGIN_KM
+            keep_i.append(a[hit])
+            keep_j.append(b[hit])
+            keep_t.append((t0 + k[hit]) * self.step_s + tau[idx, k][hit])
+        if not keep_i:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0)
+        return np.concatenate(keep_i), np.concatenate(keep_j), np.concatenate(keep_t)
+
+    def _refine(self, id_a: int, id_b: int, t_offset_s: float) -> Tuple[float, float]:
+        offsets = np.arange(t_offset_s - self.step_s, t_offset_s + self.step_s + FINE_STEP_S, FINE_STEP_S)
+        offsets = offsets[(offsets >= 0.0) & (offsets <= self.span_s)]
+        times = self.start + (offsets * 1e6).astype("timedelta64[us]")
+        jd, fr = _jd_fr(times)
+        e, r, v = SatrecArray([self.satrecs[id_a], self.satrecs[id_b]]).sgp4(jd, fr)
+        d, tau = _closest_approach(r[1] - r[0], v[1] - v[0], 0.5 * FINE_STEP_S)
+        d[(e[0] != 0) | (e[1] != 0)] = np.inf
+        k = int(np.argmin(d))
+        return float(offsets[k] + tau[k]), float(d[k])
+
+    def _screen(self, changed_rows: np.ndarray, t0: int = 0) -> Dict[Tuple[int, int], Conjunction]:
+        if t0:
+            rmin = np.full(len(self._row_ids), np.nan)
+            rmax = np.full(len(self._row_ids), np.nan)
+            active = np.flatnonzero(self._row_ids >= 0)
+            rmin[active], rmax[active] = self._shell_radii(active, t0)
+        else:
+            rmin, rmax = self._rmin, self._rmax
+        return self._screen_pairs(*self._candidate_pairs(changed_rows, rmin, rmax), t0)
+
+    def _screen_pairs(self, pi: np.ndarray, pj: np.ndarray, t0: int = 0) -> Dict[Tuple[int, int], Conjunction]:
+        ci, cj, ct = self._coarse_screen(pi, pj, t0)
+        found = {}
+        for a, b, t in zip(self._row_ids[ci], self._row_ids[cj], ct):
+            a, b = (int(a), int(b)) if a < b else (int(b), int(a))
+            t_s, miss = self._refine(a, b, float(t))
+            if miss <= self.threshold_km:
+                tca = self.start + np.timedelta64(int(round(t_s * 1e6)), "us")
+                found[(a, b)] = Conjunction(a, b, tca, miss)
+        return found
+
+    # ---- refresh loop ----
+
+    def refresh(self, df: pd.DataFrame) -> List[Alert]:
+        """
+        Ingest a fresh catalog (CelesTrak or Space-Track TLE columns) and re-screen only
+        the objects whose elements changed. Objects missing from `df` are dropped silently.
+        Returns alerts for new or changed conjunctions.
+        """
+        _, line1, line2 = tle_columns(df)
+        latest: Dict[int, Tuple[str, str]] = {}
+        for l1, l2 in zip(line1, line2):
+            sat_id = parse_norad_from_tle1(l1)
+            if sat_id is not None:
+                latest[sat_id] = (l1, l2)
+
+        self._drop_objects([i for i in self.fingerprints if i not in latest])
+
+        changed: List[int] = []
+        for sat_id, (l1, l2) in latest.items():
+            fp = tle_fingerprint(l1, l2)
+            if self.fingerprints.get(sat_id) == fp:
+                continue
+            try:
+                self.satrecs[sat_id] = Satrec.twoline2rv(l1, l2, WGS72)
+            except Exception as e:
+                print(f"Skipping {sat_id}: bad TLE ({e})")
+                continue
+            self.fingerprints[sat_id] = fp
+            changed.append(sat_id)
+        if not changed:
+            return []
+
+        previous: Dict[Tuple[int, int], Conjunction] = {}
+        for sat_id in changed:
+            previous.update(self._forget_pairs(sat_id))
+
+        return self._record(self._screen(self._propagate(changed)), previous)
+
+    def _record(self, found: Dict[Tuple[int, int], Conjunction],
+                previous: Dict[Tuple[int, int], Conjunction]) -> List[Alert]:
+        """
+        Store `found` conjunctions and return alerts for those that are new or moved
+        beyond the change tolerances relative to `previous`.
+        """
+        alerts: List[Alert] = []
+        for key, conj in found.items():
+            self.conjunctions[key] = conj
+            self._pairs_by_id.setdefault(key[0], set()).add(key)
+            self._pairs_by_id.setdefault(key[1], set()).add(key)
+            old = previous.get(key)
+            if old is None:
+                alerts.append(Alert("new", conj, None))
+            elif (abs(conj.miss_km - old.miss_km) > self.change_tol_km
+                  or abs((conj.tca - old.tca) / np.timedelta64(1, "s")) > self.change_tol_s):
+                alerts.append(Alert("changed", conj, old))
+        return alerts
+
+    def run(self, fetch: Callable[[], pd.DataFrame], interval_s: float = 6 * 3600,
+            on_alerts: Optional[Callable[[List[Alert]], None]] = None,
+            reanchor_after_s: Optional[float] = None, max_cycles: Optional[int] = None) -> None:
+        """
+        Poll `fetch` (e.g. CelesTrakAPI.fetch_debris_groups) every `interval_s` seconds.
+        Once the window start is older than `reanchor_after_s` (default: half the span),
+        the window slides forward by whole steps to the latest step before now.
+        """
+        if on_alerts is None:
+            on_alerts = print_alerts
+        if reanchor_after_s is None:
+            reanchor_after_s = 0.5 * self.span_s
+        cycle = 0
+        while max_cycles is None or cycle < max_cycles:
+            now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), "us")
+            elapsed_s = (now - self.start) / np.timedelta64(1, "s")
+            alerts: List[Alert] = []
+            try:
+                if elapsed_s > reanchor_after_s:
+                    steps = int(elapsed_s // self.step_s)
+                    alerts += self.set_window(self.start + np.timedelta64(int(round(steps * self.step_s * 1e6)), "us"))
+                alerts += self.refresh(fetch())
+                if alerts:
+                    on_alerts(alerts)
+            except Exception as e:
+                print("Refresh failed:", e)
+            cycle += 1
+            if max_cycles is None or cycle < max_cycles:
+                time.sleep(interval_s)
+
+
+def print_alerts(alerts: List[Alert]) -> None:
+    for alert in alerts:
+        c = alert.conjunction
+        line = f"[{alert.kind.upper()}] {c.id_a} x {c.id_b}  TCA {c.tca}  miss {c.miss_km:.3f} km"
+        if alert.previous is not None:
+            line += f"  (was {alert.previous.miss_km:.3f} km at {alert.previous.tca})"
+        print(line)
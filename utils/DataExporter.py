@@ -0,0 +1,268 @@
+import itertools
+import os
+import string
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.TleUtils import omm_frame, tle_columns
+
+"""
+Streaming export pipeline for TLE and CDM DataFrames.
+- Records flow through the writers as generator-produced DataFrame batches.
+- Each batch is rendered with vectorized numpy/pandas ops and written with a single bulk write.
+- Files are written to a temp file in the target directory and atomically renamed into place.
+- Per-group files are written in parallel.
+Supported formats: tle, omm_json, omm_xml, csv, parquet (parquet requires pyarrow).
+"""
+
+DEFAULT_BATCH_SIZE = 10_000
+WRITE_BUFFER_BYTES = 1 << 20
+
+FORMAT_SUFFIX = {
+    "tle": ".tle",
+    "omm_json": ".json",
+    "omm_xml": ".xml",
+    "csv": ".csv",
+    "parquet": ".parquet",
+}
+
+OMM_XML_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<ndm xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    'xsi:noNamespaceSchemaLocation="https://sanaregistry.org/r/ndmxml_unqualified/ndmxml-2.0.0-master-2.0.xsd">\n'
+)
+OMM_XML_FOOTER = "</ndm>\n"
+OMM_XML_TEMPLATE = (
+    '<omm id="CCSDS_OMM_VERS" version="2.0">'
+    "<header><CREATION_DATE>{creation}</CREATION_DATE><ORIGINATOR>SpaceDebrisAnalysis</ORIGINATOR></header>"
+    "<body><segment>"
+    "<metadata><OBJECT_NAME>{OBJECT_NAME}</OBJECT_NAME><OBJECT_ID>{OBJECT_ID}</OBJECT_ID>"
+    "<CENTER_NAME>EARTH</CENTER_NAME><REF_FRAME>TEME</REF_FRAME><TIME_SYSTEM>UTC</TIME_SYSTEM>"
+    "<MEAN_ELEMENT_THEORY>SGP4</MEAN_ELEMENT_THEORY></metadata>"
+    "<data><meanElements><EPOCH>{EPOCH}</EPOCH><MEAN_MOTION>{MEAN_MOTION}</MEAN_MOTION>"
+    "<ECCENTRICITY>{ECCENTRICITY}</ECCENTRICITY><INCLINATION>{INCLINATION}</INCLINATION>"
+    "<RA_OF_ASC_NODE>{RA_OF_ASC_NODE}</RA_OF_ASC_NODE><ARG_OF_PERICENTER>{ARG_OF_PERICENTER}</ARG_OF_PERICENTER>"
+    "<MEAN_ANOMALY>{MEAN_ANOMALY}</MEAN_ANOMALY></meanElements>"
+    "<tleParameters><EPHEMERIS_TYPE>{EPHEMERIS_TYPE}</EPHEMERIS_TYPE>"
+    "<CLASSIFICATION_TYPE>{CLASSIFICATION_TYPE}</CLASSIFICATION_TYPE><NORAD_CAT_ID>{NORAD_CAT_ID}</NORAD_CAT_ID>"
+    "<ELEMENT_SET_NO>{ELEMENT_SET_NO}</ELEMENT_SET_NO><REV_AT_EPOCH>{REV_AT_EPOCH}</REV_AT_EPOCH>"
+    "<BSTAR>{BSTAR}</BSTAR><MEAN_MOTION_DOT>{MEAN_MOTION_DOT}</MEAN_MOTION_DOT>"
+    "<MEAN_MOTION_DDOT>{MEAN_MOTION_DDOT}</MEAN_MOTION_DDOT></tleParameters></data>"
+    "</segment></body></omm>\n"
+)
+
+
+def iter_batches(df: pd.DataFrame, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+    # An empty frame still yields once so writers can emit headers/schemas
+    if df.empty:
+        yield df
+        return
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start:start + batch_size]
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w"):
+    """
+    Open a temp file next to `path` for writing and rename it over `path` on success.
+    On failure the temp file is removed and any existing `path` is left untouched.
+    """
+    out_dir = os.path.dirname(os.path.abspath(path))
+    os.makedirs(out_dir, exist_ok=True)
+    # Created 0666 so the kernel applies the umask, as a plain open() would
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp_path = os.path.join(out_dir, f".{os.path.basename(path)}.{os.urandom(6).hex()}.tmp")
+        try:
+            fd = os.open(tmp_path, flags, 0o666)
+            break
+        except FileExistsError:
+            continue
+    kwargs = {} if "b" in mode else {"encoding": "utf-8", "newline": ""}
+    try:
+        # Keep an existing target's mode
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        f = os.fdopen(fd, mode, buffering=WRITE_BUFFER_BYTES, **kwargs)
+    except BaseException:
+        os.close(fd)
+        os.remove(tmp_path)
+        raise
+    try:
+        with f:
+            yield f
+            # The data must be on disk before the rename, or a crash can leave an empty target
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_tle(batches: Iterable[pd.DataFrame], path: str) -> int:
+    n = 0
+    with atomic_open(path) as f:
+        for batch in batches:
+            name, line1, line2 = tle_columns(batch)
+            f.write((name + "\n" + line1 + "\n" + line2 + "\n").str.cat())
+            n += len(batch)
+    return n
+
+
+def write_csv(batches: Iterable[pd.DataFrame], path: str) -> int:
+    n = 0
+    header = True
+    with atomic_open(path) as f:
+        for batch in batches:
+            f.write(batch.to_csv(index=False, header=header))
+            header = False
+            n += len(batch)
+    return n
+
+
+def write_omm_json(batches: Iterable[pd.DataFrame], path: str) -> int:
+    n = 0
+    with atomic_open(path) as f:
+        f.write("[")
+        for batch in batches:
+            if batch.empty:
+                continue
+            body = omm_frame(batch).to_json(orient="records", double_precision=15)[1:-1]
+            f.write(body if n == 0 else "," + body)
+            n += len(batch)
+        f.write("]\n")
+    return n
+
+
+def _xml_escape(values: np.ndarray) -> np.ndarray:
+    for raw, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")):
+        values = np.char.replace(values, raw, entity)
+    return values
+
+
+def omm_xml_text(omm: pd.DataFrame, creation: str) -> str:
+    """
+    Render OMM records as concatenated <omm> elements. Each column is converted to text
+    in one numpy call, and rows are stitched with C-level zip/join rather than per-row formatting.
+    """
+    if omm.empty:
+        return ""
+    text = {k: omm[k].to_numpy().astype(str) for k in omm.columns}
+    text["OBJECT_NAME"] = _xml_escape(text["OBJECT_NAME"])
+    text["OBJECT_ID"] = _xml_escape(text["OBJECT_ID"])
+    text["creation"] = np.full(len(omm), creation)
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(OMM_XML_TEMPLATE):
+        parts.append(itertools.repeat(literal))
+        if field is not None:
+            parts.append(text[field].tolist())
+    return "".join(map("".join, zip(*parts)))
+
+
+def write_omm_xml(batches: Iterable[pd.DataFrame], path: str) -> int:
+    n = 0
+    creation = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+    with atomic_open(path) as f:
+        f.write(OMM_XML_HEADER)
+        for batch in batches:
+            f.write(omm_xml_text(omm_frame(batch), creation))
+            n += len(batch)
+        f.write(OMM_XML_FOOTER)
+    return n
+
+
+def write_parquet(batches: Iterable[pd.DataFrame], path: str, compression: str = "zstd") -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from e
+
+    n = 0
+    writer = None
+    with atomic_open(path, "wb") as f:
+        try:
+            for batch in batches:
+                table = pa.Table.from_pandas(batch, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(f, table.schema, compression=compression)
+                else:
+                    table = table.cast(writer.schema)
+                writer.write_table(table)
+                n += len(batch)
+            if writer is None:
+                pq.write_table(pa.table({}), f, compression=compression)
+        finally:
+            if writer is not None:
+                writer.close()
+    return n
+
+
+WRITERS: Dict[str, Callable[[Iterable[pd.DataFrame], str], int]] = {
+    "tle": write_tle,
+    "omm_json": write_omm_json,
+    "omm_xml": write_omm_xml,
+    "csv": write_csv,
+    "parquet": write_parquet,
+}
+
+
+def export_records(batches: Iterable[pd.DataFrame], path: str, fmt: str) -> int:
+    """
+    Stream DataFrame batches into `path` in the given format. Returns the number of records written.
+    """
+    try:
+        writer = WRITERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {sorted(WRITERS)}")
+    return writer(batches, path)
+
+
+def export_frame(df: pd.DataFrame, path: str, fmt: str = "csv", batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    return export_records(iter_batches(df, batch_size), path, fmt)
+
+
+def export_catalog(
+    df: pd.DataFrame,
+    out_dir: str,
+    basename: str,
+    combined_formats: Sequence[str] = ("csv",),
+    group_formats: Sequence[str] = ("tle",),
+    group_col: str = "group",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Export a catalog to `{basename}{suffix}` for each combined format and to
+    `{basename}_{group}{suffix}` for each group/format pair. All files are written
+    in parallel. Returns the list of written paths.
+    """
+    for fmt in list(combined_formats) + list(group_formats):
+        if fmt not in WRITERS:
+            raise ValueError(f"Unknown export format {fmt!r}; expected one of {sorted(WRITERS)}")
+
+    jobs: List[Tuple[pd.DataFrame, str, str]] = []
+    for fmt in combined_formats:
+        jobs.append((df, os.path.join(out_dir, f"{basename}{FORMAT_SUFFIX[fmt]}"), fmt))
+    if group_formats and group_col in df.columns:
+        for group, gdf in df.groupby(group_col, sort=False):
+            for fmt in group_formats:
+                jobs.append((gdf, os.path.join(out_dir, f"{basename}_{group}{FORMAT_SUFFIX[fmt]}"), fmt))
+
+    os.makedirs(out_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(export_frame, frame, path, fmt, batch_size) for frame, path, fmt in jobs]
+        for fut in futures:
+            fut.result()
+    return [path for _, path, _ in jobs]
@@ -3,6 +3,7 @@ from pathlib import Path
 
 from APIs.CelesTrakAPI import fetch_debris_groups as ct_fetch, save_tles as ct_save
 from APIs.SpaceTrackAPI import SpaceTrackClient, SpaceTrackAuthError
+from utils.DataExporter import export_frame
 
 DATA_DIR = Path("../DATA")
 DATA_DIR.mkdir(exist_ok=True)
@@ -10,7 +11,7 @@ DATA_DIR.mkdir(exist_ok=True)
 
 def save_df(df: pd.DataFrame, name: str) -> None:
     out_path = DATA_DIR / name
-    df.to_csv(out_path, index=False)
+    export_frame(df, str(out_path), "csv")
     print(f"Saved {len(df)} rows to {out_path}")
 
 
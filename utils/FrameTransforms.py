@@ -0,0 +1,160 @@
+import numpy as np
+from collections import OrderedDict
+from typing import Tuple
+
+from utils.TleUtils import R_EARTH_KM
+
+"""
+Batched TEME -> ECEF -> geodetic conversions for ground tracks.
+- GMST and the Earth-rotation matrices are computed once per time grid and cached.
+- Every object propagated on the same grid reuses the cached terms.
+- States are arrays shaped (N_objects, N_times, 3) or (N_objects, N_times, 6), in km and km/s.
+"""
+
+# WGS84 ellipsoid
+FLATTENING_WGS84 = 1.0 / 298.257223563
+E2_WGS84 = FLATTENING_WGS84 * (2.0 - FLATTENING_WGS84)
+B_WGS84_KM = R_EARTH_KM * (1.0 - FLATTENING_WGS84)
+# Earth rotation rate used by the SGP4/TEME convention (rad/s)
+OMEGA_EARTH_RAD_S = 7.292115146706979e-5
+
+J2000_JD = 2451545.0
+J2000_DATETIME64 = np.datetime64("2000-01-01T12:00:00", "us")
+
+ROTATION_CACHE_SIZE = 32
+_ROTATION_CACHE: "OrderedDict[Tuple[bytes, int], Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+
+
+def datetime64_to_jd(time_arr: np.ndarray) -> np.ndarray:
+    """
+    Convert a numpy datetime64 array (UTC, treated as UT1) to Julian dates.
+    """
+    t = np.asarray(time_arr).astype("datetime64[us]")
+    days = (t - J2000_DATETIME64) / np.timedelta64(1, "D")
+    return J2000_JD + days
+
+
+def gmst_rad(jd: np.ndarray) -> np.ndarray:
+    """
+    Greenwich Mean Sidereal Time (IAU-82, as used by SGP4/TEME) in radians.
+    """
+    T = (np.asarray(jd, dtype=float) - J2000_JD) / 36525.0
+    gmst_sec = (67310.54841
+                + (876600.0 * 3600.0 + 8640184.812866) * T
+                + 0.093104 * T ** 2
+                - 6.2e-6 * T ** 3)
+    return np.mod(gmst_sec, 86400.0) * (2.0 * np.pi / 86400.0)
+
+
+def earth_rotation_terms(time_arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return (gmst, R) for a time grid, where R has shape (N_times, 3, 3) and maps TEME to ECEF.
+    Results are cached per time grid, so repeated calls with the same grid are free.
+    Polar motion is neglected (ECEF here is the pseudo Earth-fixed frame).
+    """
+    t = np.ascontiguousarray(np.asarray(time_arr).astype("datetime64[us]"))
+    key = (t.tobytes(), t.size)
+    cached = _ROTATION_CACHE.get(key)
+    if cached is not None:
+        _ROTATION_CACHE.move_to_end(key)
+        return cached
+
+    gmst = gmst_rad(datetime64_to_jd(t))
+    c, s = np.cos(gmst), np.sin(gmst)
+    R = np.zeros((t.size, 3, 3))
+    R[:, 0, 0] = c
+    R[:, 0, 1] = s
+    R[:, 1, 0] = -s
+    R[:, 1, 1] = c
+    R[:, 2, 2] = 1.0
+    gmst.setflags(write=False)
+    R.setflags(write=False)
+
+    _ROTATION_CACHE[key] = (gmst, R)
+    if len(_ROTATION_CACHE) > ROTATION_CACHE_SIZE:
+        _ROTATION_CACHE.popitem(last=False)
+    return gmst, R
+
+
+def clear_rotation_cache() -> None:
+    _ROTATION_CACHE.clear()
+
+
+def stack_state_vectors(state_vectors_list) -> np.ndarray:
+    """
+    Stack OrbitPlotter-style state vectors ([X, Y, Z, VX, VY, VZ] per object) into
+    an array of shape (N_objects, N_times, 6). All objects must share the same time grid.
+    """
+    return np.stack([np.column_stack(sv) for sv in state_vectors_list], axis=0)
+
+
+def teme_to_ecef(states: np.ndarray, time_arr: np.ndarray) -> np.ndarray:
+    """
+    Rotate TEME states of shape (N_objects, N_times, 3 or 6) into ECEF.
+    A single object shaped (N_times, 3 or 6) is also accepted.
+    Velocities, when present, include the Earth-rotation (omega x r) correction.
+    """
+    states = np.asarray(states, dtype=float)
+    squeeze = states.ndim == 2
+    if squeeze:
+        states = states[np.newaxis]
+    if states.ndim != 3 or states.shape[-1] not in (3, 6):
+        raise ValueError(f"Expected states shaped (N_objects, N_times, 3|6), got {states.shape}")
+
+    _, R = earth_rotation_terms(time_arr)
+    if R.shape[0] != states.shape[1]:
+        raise ValueError(f"Time grid has {R.shape[0]} steps but states have {states.shape[1]}")
+
+    r_ecef = np.einsum("tij,ntj->nti", R, states[..., :3])
+    if states.shape[-1] == 3:
+        out = r_ecef
+    else:
+        v_rot = np.einsum("tij,ntj->nti", R, states[..., 3:])
+        # v_ecef = R v_teme - omega x r_ecef, with omega = [0, 0, OMEGA_EARTH_RAD_S]
+        v_rot[..., 0] += OMEGA_EARTH_RAD_S * r_ecef[..., 1]
+        v_rot[..., 1] -= OMEGA_EARTH_RAD_S * r_ecef[..., 0]
+        out = np.concatenate([r_ecef, v_rot], axis=-1)
+    return out[0] if squeeze else out
+
+
+def ecef_to_geodetic(r_ecef: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Closed-form (Heikkinen) ECEF -> WGS84 geodetic conversion over arrays of any leading shape.
+    Input positions are in km with the last axis holding (x, y, z).
+    Returns (lat_deg, lon_deg, alt_km), each with the input's leading shape.
+    """
+    r_ecef = np.asarray(r_ecef, dtype=float)
+    x, y, z = r_ecef[..., 0], r_ecef[..., 1], r_ecef[..., 2]
+    a, b, e2 = R_EARTH_KM, B_WGS84_KM, E2_WGS84
+    ep2 = (a * a - b * b) / (b * b)
+
+    p = np.hypot(x, y)
+    z2 = z * z
+    F = 54.0 * b * b * z2
+    G = p * p + (1.0 - e2) * z2 - e2 * (a * a - b * b)
+    c = e2 * e2 * F * p * p / G ** 3
+    s = np.cbrt(1.0 + c + np.sqrt(c * c + 2.0 * c))
+    P = F / (3.0 * (s + 1.0 / s + 1.0) ** 2 * G * G)
+    Q = np.sqrt(1.0 + 2.0 * e2 * e2 * P)
+    r0 = (-(P * e2 * p) / (1.0 + Q)
+          + np.sqrt(np.maximum(0.5 * a * a * (1.0 + 1.0 / Q)
+                               - P * (1.0 - e2) * z2 / (Q * (1.0 + Q))
+                               - 0.5 * P * p * p, 0.0)))
+    U = np.sqrt((p - e2 * r0) ** 2 + z2)
+    V = np.sqrt((p - e2 * r0) ** 2 + (1.0 - e2) * z2)
+    z0 = b * b * z / (a * V)
+
+    alt = U * (1.0 - b * b / (a * V))
+    lat = np.degrees(np.arctan2(z + ep2 * z0, p))
+    lon = np.degrees(np.arctan2(y, x))
+    return lat, lon, alt
+
+
+def ground_track(states: np.ndarray, time_arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sub-satellite points for TEME states on a shared time grid.
+    Returns (lat_deg, lon_deg, alt_km), each shaped (N_objects, N_times)
+    (or (N_times,) when a single object was given).
+    """
+    r_ecef = teme_to_ecef(np.asarray(states)[..., :3], time_arr)
+    return ecef_to_geodetic(r_ecef)
@@ -0,0 +1,236 @@
+import numpy as np
+import pandas as pd
+from typing import NamedTuple, Optional, Tuple
+
+from utils.TleUtils import MU_EARTH_KM3_S2, R_EARTH_KM, omm_frame
+
+"""
+Batch MOID (minimum orbit intersection distance) for catalog pre-filtering.
+- Orbits are described by their geometry only (a, e, P/Q unit vectors); no time or propagation.
+- For each pair, orbit 1 is sampled on an eccentric-anomaly grid and each sample's distance to orbit 2
+  is found by Newton root-finding on the in-plane point-to-ellipse problem.
+- The best local minima along the grid are then refined by bracketed root-finding on the analytic
+  derivative of that distance with respect to orbit 1's anomaly.
+- Pairs whose MOID exceeds a threshold can never come closer than that, so they are dropped
+  before any SGP4 propagation.
+MOID is computed for the fixed mean-element ellipse. SGP4 positions sit off that ellipse by short-period
+J2 terms (bounded by short_period_pad_km), and the ellipse itself drifts with time. moid_prefilter pads
+for the former and is valid at the TLE epochs; ConjunctionMonitor evaluates the geometry at mid-window
+and also pads for the drift across its window.
+"""
+
+GRID_POINTS = 96
+REFINE_CANDIDATES = 4
+INNER_NEWTON_ITERATIONS = 6
+WARM_NEWTON_ITERATIONS = 2
+ROOT_ITERATIONS = 10
+# Upper bound on pair x grid-point elements evaluated in one chunk
+MOID_CHUNK_ELEMENTS = 200_000
+J2_EARTH = 1.08262998905e-3
+# Largest short-period offset of SGP4 near-earth positions from the mean ellipse, in units of J2 * R_E^2 / p.
+# Measured at ~1.25 over LEO-MEO, e <= 0.75 and B* <= 3e-3; doubled for margin.
+SHORT_PERIOD_FACTOR = 2.0
+
+
+class OrbitGeometry(NamedTuple):
+    a: np.ndarray  # semi-major axis (km)
+    b: np.ndarray  # semi-minor axis (km)
+    e: np.ndarray
+    P: np.ndarray  # (N, 3) unit vector towards perigee
+    Q: np.ndarray  # (N, 3) unit vector 90 deg ahead in the orbit plane
+
+
+def orbit_geometry(a_km, ecc, inc_deg, raan_deg, argp_deg) -> OrbitGeometry:
+    a = np.atleast_1d(np.asarray(a_km, dtype=float))
+    e = np.atleast_1d(np.asarray(ecc, dtype=float))
+    i, raan, argp = (np.radians(np.atleast_1d(np.asarray(x, dtype=float))) for x in (inc_deg, raan_deg, argp_deg))
+    cO, sO, ci, si, cw, sw = np.cos(raan), np.sin(raan), np.cos(i), np.sin(i), np.cos(argp), np.sin(argp)
+    P = np.stack([cO * cw - sO * sw * ci, sO * cw + cO * sw * ci, sw * si], axis=-1)
+    Q = np.stack([-cO * sw - sO * cw * ci, -sO * sw + cO * cw * ci, cw * si], axis=-1)
+    return OrbitGeometry(a, a * np.sqrt(1.0 - e * e), e, P, Q)
+
+
+def short_period_pad_km(a_km, ecc) -> np.ndarray:
+    """
+    Bound (km) on how far short-period J2 terms move a near-earth object off its mean-element ellipse.
+    """
+    a = np.asarray(a_km, dtype=float)
+    e = np.asarray(ecc, dtype=float)
+    return SHORT_PERIOD_FACTOR * J2_EARTH * R_EARTH_KM ** 2 / (a * (1.0 - e * e))
+
+
+def orbits_from_tles(df: pd.DataFrame) -> Tuple[np.ndarray, OrbitGeometry]:
+    """
+    Build orbit geometry from a TLE DataFrame (CelesTrak or Space-Track columns).
+    Returns (norad_ids, geometry). The semi-major axis comes from the TLE mean motion.
+    """
+    omm = omm_frame(df)
+    n_rad_s = omm["MEAN_MOTION"].to_numpy(dtype=float) * 2.0 * np.pi / 86400.0
+    a = (MU_EARTH_KM3_S2 / (n_rad_s * n_rad_s)) ** (1.0 / 3.0)
+    geom = orbit_geometry(a, omm["ECCENTRICITY"].to_numpy(dtype=float), omm["INCLINATION"].to_numpy(dtype=float),
+                          omm["RA_OF_ASC_NODE"].to_numpy(dtype=float), omm["ARG_OF_PERICENTER"].to_numpy(dtype=float))
+    return omm["NORAD_CAT_ID"].to_numpy(dtype=float), geom
+
+
+def _subset(g: OrbitGeometry, idx: np.ndarray) -> OrbitGeometry:
+    return OrbitGeometry(g.a[idx], g.b[idx], g.e[idx], g.P[idx], g.Q[idx])
+
+
+def _position(g: OrbitGeometry, E: np.ndarray) -> np.ndarray:
+    """
+    Position on each orbit at eccentric anomaly E. g holds n orbits, E is shaped (n, m); returns (n, m, 3).
+    """
+    x = g.a[:, np.newaxis] * (np.cos(E) - g.e[:, np.newaxis])
+    y = g.b[:, np.newaxis] * np.sin(E)
+    return x[..., np.newaxis] * g.P[:, np.newaxis, :] + y[..., np.newaxis] * g.Q[:, np.newaxis, :]
+
+
+def _nearest_on_orbit(g: OrbitGeometry, X: np.ndarray, E: Optional[np.ndarray] = None,
+                      iterations: int = INNER_NEWTON_ITERATIONS) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Squared distance from points X (n, m, 3) to each of the n orbits in g, the nearest point and its E.
+    The nearest point on a conic to X is the nearest point to X's projection onto the orbit plane,
+    so this reduces to a 1D point-to-ellipse problem solved by Newton's method on E.
+    A previous solution can be passed as `E` to warm-start the iteration.
+    """
+    a, b, e = g.a[:, np.newaxis], g.b[:, np.newaxis], g.e[:, np.newaxis]
+    x = np.einsum("nmk,nk->nm", X, g.P)
+    y = np.einsum("nmk,nk->nm", X, g.Q)
+    z2 = np.maximum(np.einsum("nmk,nmk->nm", X, X) - x * x - y * y, 0.0)
+    # Ellipse centred coordinates; the cold-start guess is exact for circles
+    u, v = x + a * e, y
+    if E is None:
+        E = np.arctan2(a * v, b * u)
+    for _ in range(iterations):
+        sE, cE = np.sin(E), np.cos(E)
+        f = (b * b - a * a) * sE * cE + a * u * sE - b * v * cE
+        fp = (b * b - a * a) * (cE * cE - sE * sE) + a * u * cE + b * v * sE
+        step = np.where(fp > 0.0, -f / np.where(fp > 0.0, fp, 1.0), -np.sign(f) * 0.1)
+        E = E + np.clip(step, -0.5, 0.5)
+    sE, cE = np.sin(E), np.cos(E)
+    d2 = (a * cE - u) ** 2 + (b * sE - v) ** 2 + z2
+    nearest = (a * (cE - e))[..., np.newaxis] * g.P[:, np.newaxis, :] + (b * sE)[..., np.newaxis] * g.Q[:, np.newaxis, :]
+    return d2, nearest, E
+
+
+def _slope(g1: OrbitGeometry, g2: OrbitGeometry, E1: np.ndarray, E2: Optional[np.ndarray] = None,
+           iterations: int = INNER_NEWTON_ITERATIONS) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    D2(E1) = squared distance from orbit 1 at E1 to orbit 2, dD2/dE1 / 2, and the E2 of the nearest point.
+    By the envelope theorem the derivative only needs the tangent of orbit 1.
+    """
+    r1 = _position(g1, E1)
+    tangent = (-g1.a[:, np.newaxis] * np.sin(E1))[..., np.newaxis] * g1.P[:, np.newaxis, :] \
+        + (g1.b[:, np.newaxis] * np.cos(E1))[..., np.newaxis] * g1.Q[:, np.newaxis, :]
+    d2, nearest, E2 = _nearest_on_orbit(g2, r1, E2, iterations)
+    return d2, np.einsum("nmk,nmk->nm", r1 - nearest, tangent), E2
+
+
+def _moid_chunk(g1: OrbitGeometry, g2: OrbitGeometry) -> np.ndarray:
+    n = len(g1.a)
+    grid = np.linspace(0.0, 2.0 * np.pi, GRID_POINTS, endpoint=False)
+    step = grid[1] - grid[0]
+
+    # D2(E1) sampled on the grid; its local minima bracket the candidate MOID locations
+    D, _, E2_grid = _nearest_on_orbit(g2, _position(g1, np.broadcast_to(grid, (n, GRID_POINTS))))
+    local = (D <= np.roll(D, 1, axis=1)) & (D <= np.roll(D, -1, axis=1))
+    k = min(REFINE_CANDIDATES, GRID_POINTS)
+    best = np.argpartition(np.where(local, D, np.inf), k - 1, axis=1)[:, :k]
+    result = D.min(axis=1)
+
+    # Root-find dD2/dE1 = 0 inside [E1 - step, E1 + step] with the Illinois (modified regula falsi) method
+    lo, hi = grid[best] - step, grid[best] + step
+    _, g_lo, _ = _slope(g1, g2, lo)
+    _, g_hi, _ = _slope(g1, g2, hi)
+    E2 = np.take_along_axis(E2_grid, best, axis=1)
+    bracketed = (g_lo <= 0.0) & (g_hi >= 0.0)
+    mid = grid[best]
+    for _ in range(ROOT_ITERATIONS):
+        denom = g_hi - g_lo
+        x = np.where(bracketed & (denom > 0.0), (lo * g_hi - hi * g_lo) / np.where(denom > 0.0, denom, 1.0), mid)
+        # Successive iterates move little, so warm-start the inner solve from the last nearest point
+        d2, g_x, E2 = _slope(g1, g2, x, E2, WARM_NEWTON_ITERATIONS)
+        right = g_x > 0.0
+        # Halve the stale end's slope so the bracket keeps shrinking from both sides
+        g_lo = np.where(right, g_lo * 0.5, g_x)
+        lo = np.where(right, lo, x)
+        g_hi = np.where(right, g_x, g_hi * 0.5)
+        hi = np.where(right, x, hi)
+        result = np.fmin(result, d2.min(axis=1))
+    return np.sqrt(result)
+
+
+def moid_pairs(orbits_a: OrbitGeometry, orbits_b: OrbitGeometry, ia: np.ndarray, ib: np.ndarray) -> np.ndarray:
+    """
+    MOID (km) between orbits_a[ia[k]] and orbits_b[ib[k]] for every k.
+    """
+    ia, ib = np.asarray(ia, dtype=np.int64), np.asarray(ib, dtype=np.int64)
+    out = np.empty(len(ia))
+    chunk = max(1, MOID_CHUNK_ELEMENTS // GRID_POINTS)
+    for start in range(0, len(ia), chunk):
+        sl = slice(start, start + chunk)
+        out[sl] = _moid_chunk(_subset(orbits_a, ia[sl]), _subset(orbits_b, ib[sl]))
+    return out
+
+
+def moid_one_to_many(orbits: OrbitGeometry, index: int, others: Optional[OrbitGeometry] = None) -> np.ndarray:
+    """
+    MOID between orbits[index] and every orbit in `others` (default: `orbits` itself).
+    """
+    others = orbits if others is None else others
+    n = len(others.a)
+    return moid_pairs(orbits, others, np.full(n, index), np.arange(n))
+
+
+def moid_many_to_many(orbits_a: OrbitGeometry, orbits_b: Optional[OrbitGeometry] = None) -> np.ndarray:
+    """
+    Full (N_a, N_b) MOID matrix. For large catalogs prefer moid_prefilter, which skips
+    pairs whose perigee/apogee shells cannot overlap.
+    """
+    orbits_b = orbits_a if orbits_b is None else orbits_b
+    ia, ib = np.meshgrid(np.arange(len(orbits_a.a)), np.arange(len(orbits_b.a)), indexing="ij")
+    return moid_pairs(orbits_a, orbits_b, ia.ravel(), ib.ravel()).reshape(ia.shape)
+
+
+def shell_overlap_pairs(orbits: OrbitGeometry, threshold_km: float, rows: Optional[np.ndarray] = None,
+                        chunk_elements: int = MOID_CHUNK_ELEMENTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Index pairs (i < j) whose perigee/apogee radius ranges overlap within `threshold_km`.
+    If `rows` is given, only pairs with i in `rows` are considered (j still spans every orbit).
+    """
+    q = orbits.a * (1.0 - orbits.e)
+    Q = orbits.a * (1.0 + orbits.e)
+    n = len(q)
+    rows = np.arange(n) if rows is None else np.asarray(rows, dtype=np.int64)
+    cols = np.arange(n)
+    out_i, out_j = [], []
+    chunk = max(1, chunk_elements // max(n, 1))
+    for start in range(0, len(rows), chunk):
+        ri = rows[start:start + chunk]
+        mask = ((q[np.newaxis, :] - Q[ri][:, np.newaxis] <= threshold_km)
+                & (q[ri][:, np.newaxis] - Q[np.newaxis, :] <= threshold_km)
+                & (cols[np.newaxis, :] > ri[:, np.newaxis]))
+        ii, jj = np.nonzero(mask)
+        out_i.append(ri[ii])
+        out_j.append(cols[jj])
+    if not out_i:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(out_i), np.concatenate(out_j)
+
+
+def moid_prefilter(df: pd.DataFrame, threshold_km: float) -> pd.DataFrame:
+    """
+    Candidate pairs for time-based screening from a TLE catalog: pairs whose shells overlap
+    and whose MOID is within `threshold_km` plus both objects' short-period allowance.
+    The geometry is taken at each TLE's epoch. Returns columns id_a, id_b, moid_km.
+    """
+    ids, orbits = orbits_from_tles(df)
+    pad = short_period_pad_km(orbits.a, orbits.e)
+    ii, jj = shell_overlap_pairs(orbits, threshold_km + 2.0 * pad.max(initial=0.0))
+    moid = moid_pairs(orbits, orbits, ii, jj)
+    keep = moid <= threshold_km + pad[ii] + pad[jj]
+    return pd.DataFrame({
+        "id_a": pd.array(ids[ii[keep]], dtype="Float64").astype("Int64"),
+        "id_b": pd.array(ids[jj[keep]], dtype="Float64").astype("Int64"),
+        "moid_km": moid[keep],
+    })
@@ -2,6 +2,9 @@ import re
 from typing import Optional, Tuple
 import math
 
+import numpy as np
+import pandas as pd
+
 MU_EARTH_KM3_S2 = 398600.4418
 R_EARTH_KM = 6378.137
 
@@ -78,3 +81,133 @@ def classify_regime(alt_km: Optional[float]) -> Optional[str]:
     if alt_km <= 35786:
         return "MEO"
     return "HEO"
+
+
+# Fixed-column TLE field slices (0-based, end-exclusive)
+TLE_LINE1_FIELDS = {
+    "NORAD_CAT_ID": (2, 7),
+    "CLASSIFICATION_TYPE": (7, 8),
+    "INTLDES": (9, 17),
+    "EPOCH_YEAR": (18, 20),
+    "EPOCH_DAY": (20, 32),
+    "MEAN_MOTION_DOT": (33, 43),
+    "MEAN_MOTION_DDOT": (44, 52),
+    "BSTAR": (53, 61),
+    "EPHEMERIS_TYPE": (62, 63),
+    "ELEMENT_SET_NO": (64, 68),
+}
+TLE_LINE2_FIELDS = {
+    "INCLINATION": (8, 16),
+    "RA_OF_ASC_NODE": (17, 25),
+    "ECCENTRICITY": (26, 33),
+    "ARG_OF_PERICENTER": (34, 42),
+    "MEAN_ANOMALY": (43, 51),
+    "MEAN_MOTION": (52, 63),
+    "REV_AT_EPOCH": (63, 68),
+}
+
+OMM_FIELDS = [
+    "OBJECT_NAME", "OBJECT_ID", "EPOCH", "MEAN_MOTION", "ECCENTRICITY", "INCLINATION",
+    "RA_OF_ASC_NODE", "ARG_OF_PERICENTER", "MEAN_ANOMALY", "EPHEMERIS_TYPE",
+    "CLASSIFICATION_TYPE", "NORAD_CAT_ID", "ELEMENT_SET_NO", "REV_AT_EPOCH", "BSTAR",
+    "MEAN_MOTION_DOT", "MEAN_MOTION_DDOT",
+]
+
+
+def tle_columns(batch: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """
+    Return (name, line1, line2) from either CelesTrak-style (name/line1/line2)
+    or Space-Track-style (OBJECT_NAME/TLE_LINE1/TLE_LINE2) columns.
+    """
+    if {"line1", "line2"}.issubset(batch.columns):
+        name = batch["name"] if "name" in batch.columns else pd.Series("", index=batch.index)
+        return name.astype(str), batch["line1"].astype(str), batch["line2"].astype(str)
+    if {"TLE_LINE1", "TLE_LINE2"}.issubset(batch.columns):
+        if "OBJECT_NAME" in batch.columns:
+            name = batch["OBJECT_NAME"]
+        elif "TLE_LINE0" in batch.columns:
+            name = batch["TLE_LINE0"].astype(str).str.replace(r"^0 ", "", regex=True)
+        else:
+            name = pd.Series("", index=batch.index)
+        return name.astype(str), batch["TLE_LINE1"].astype(str), batch["TLE_LINE2"].astype(str)
+    raise ValueError("Batch has no TLE columns (expected line1/line2 or TLE_LINE1/TLE_LINE2)")
+
+
+def _fixed_width(lines: pd.Series, width: int = 69) -> np.ndarray:
+    """
+    View TLE lines as a (N, width) uint8 matrix so fixed columns can be sliced without per-row Python.
+    """
+    raw = np.asarray(lines.to_numpy(dtype=str), dtype=f"S{width}")
+    return raw.view(np.uint8).reshape(len(raw), width)
+
+
+def _field(u: np.ndarray, a: int, b: int) -> np.ndarray:
+    return np.ascontiguousarray(u[:, a:b]).view(f"S{b - a}").ravel()
+
+
+def _number(raw: np.ndarray) -> np.ndarray:
+    try:
+        return raw.astype(float)
+    except ValueError:
+        # Blank or malformed fields: fall back to a coercing parse (NaN where invalid)
+        text = pd.Series(np.char.decode(raw, "ascii", "replace")).str.strip()
+        return pd.to_numeric(text, errors="coerce").to_numpy(dtype=float)
+
+
+def _implied_decimal(u: np.ndarray, a: int) -> np.ndarray:
+    # Layout: sign, 5 mantissa digits, signed exponent digit (e.g. " 12345-3")
+    sign = np.where(u[:, a] == ord("-"), -1.0, 1.0)
+    mantissa = np.nan_to_num(_number(_field(u, a + 1, a + 6))) / 1e5
+    exponent = np.nan_to_num(_number(_field(u, a + 6, a + 8)))
+    return sign * mantissa * 10.0 ** exponent
+
+
+def omm_frame(batch: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build OMM mean-element records for a batch of TLEs by slicing the fixed TLE columns as byte arrays.
+    """
+    name, line1, line2 = tle_columns(batch)
+    u1, u2 = _fixed_width(line1), _fixed_width(line2)
+
+    def num1(key: str) -> np.ndarray:
+        return _number(_field(u1, *TLE_LINE1_FIELDS[key]))
+
+    def num2(key: str) -> np.ndarray:
+        return _number(_field(u2, *TLE_LINE2_FIELDS[key]))
+
+    def int1(key: str) -> np.ndarray:
+        return np.nan_to_num(num1(key)).astype(int)
+
+    intldes = pd.Series(np.char.decode(_field(u1, *TLE_LINE1_FIELDS["INTLDES"]), "ascii", "replace"),
+                        index=batch.index).str.strip()
+    launch_yy = pd.to_numeric(intldes.str[:2], errors="coerce")
+    launch_year = (launch_yy + 1900).where(launch_yy >= 57, launch_yy + 2000)
+    object_id = (launch_year.astype("Int64").astype(str) + "-" + intldes.str[2:]).where(launch_yy.notna(), "")
+
+    epoch_yy = num1("EPOCH_YEAR")
+    epoch_year = np.where(epoch_yy >= 57, 1900, 2000) + np.nan_to_num(epoch_yy).astype(int)
+    epoch = ((epoch_year - 1970).astype("datetime64[Y]").astype("datetime64[us]")
+             + ((num1("EPOCH_DAY") - 1.0) * 86400e6).round().astype("timedelta64[us]"))
+
+    classification = np.char.decode(_field(u1, *TLE_LINE1_FIELDS["CLASSIFICATION_TYPE"]), "ascii", "replace")
+
+    out = pd.DataFrame({
+        "OBJECT_NAME": name.str.strip(),
+        "OBJECT_ID": object_id,
+        "EPOCH": np.datetime_as_string(epoch, unit="us"),
+        "MEAN_MOTION": num2("MEAN_MOTION"),
+        "ECCENTRICITY": num2("ECCENTRICITY") / 1e7,
+        "INCLINATION": num2("INCLINATION"),
+        "RA_OF_ASC_NODE": num2("RA_OF_ASC_NODE"),
+        "ARG_OF_PERICENTER": num2("ARG_OF_PERICENTER"),
+        "MEAN_ANOMALY": num2("MEAN_ANOMALY"),
+        "EPHEMERIS_TYPE": int1("EPHEMERIS_TYPE"),
+        "CLASSIFICATION_TYPE": np.where(np.char.strip(classification) == "", "U", classification),
+        "NORAD_CAT_ID": pd.array(num1("NORAD_CAT_ID"), dtype="Float64").astype("Int64"),
+        "ELEMENT_SET_NO": int1("ELEMENT_SET_NO"),
+        "REV_AT_EPOCH": np.nan_to_num(num2("REV_AT_EPOCH")).astype(int),
+        "BSTAR": _implied_decimal(u1, TLE_LINE1_FIELDS["BSTAR"][0]),
+        "MEAN_MOTION_DOT": num1("MEAN_MOTION_DOT"),
+        "MEAN_MOTION_DDOT": _implied_decimal(u1, TLE_LINE1_FIELDS["MEAN_MOTION_DDOT"][0]),
+    }, index=batch.index)
+    return out[OMM_FIELDS]